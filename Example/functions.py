@@ -1,7 +1,261 @@
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 import zarr
 
-def load_fiber_data(zarr_path, fiber_number, sensor_numbers):
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional, without it the vibration timestamps are computed with numpy
+    njit = None
+
+# The chunk cache and the direct reads into preallocated buffers use the zarr v2 API
+# (LRUStoreCache, get_basic_selection with out=). With zarr 3 the store is opened by path
+# and every dataset is read with [:], zarr 3 fetches the chunks concurrently itself
+_ZARR_V2 = int(zarr.__version__.split('.')[0]) < 3
+
+# Number of store handles kept open by _open_store, and the chunk cache size of each,
+# so that all chunk caches together stay below 1 GiB
+_MAX_OPEN_STORES = 4
+_CHUNK_CACHE_SIZE = 2**30 // _MAX_OPEN_STORES
+
+# Keys holding Zarr metadata rather than chunk data
+_METADATA_KEYS = {'.zarray', '.zgroup', '.zattrs', '.zmetadata'}
+
+
+if _ZARR_V2:
+    class _ChunkCache(zarr.LRUStoreCache):
+        """
+        LRU cache of chunk data only. Listings and metadata are always read from the
+        underlying store, and all cached chunks are dropped as soon as the metadata of
+        any dataset has changed (e.g. after an append), so reads never go stale.
+        """
+
+        def __init__(self, store, max_size):
+            super().__init__(store, max_size=max_size)
+            self._metadata = {}
+
+        def __getitem__(self, key):
+            if key.rsplit('/', 1)[-1] not in _METADATA_KEYS:
+                return super().__getitem__(key)
+
+            value = self._store[key]
+            if self._metadata.get(key, value) != value:
+                self.invalidate()
+            self._metadata[key] = value
+            return value
+
+        def __contains__(self, key):
+            return key in self._values_cache or key in self._store
+
+        def __len__(self):
+            return len(self._store)
+
+        def keys(self):
+            return self._store.keys()
+
+        def listdir(self, path=None):
+            return zarr.storage.listdir(self._store, path)
+
+
+def _open_store(path, store_backend=None):
+    """
+    Opens a Zarr store in read-only mode through _open_store_cached, with str and
+    pathlib.Path paths sharing one cached handle.
+
+    Parameters:
+        path (str or os.PathLike): Path to the Zarr store.
+        store_backend (str, optional): See _open_store_cached.
+
+    Returns:
+        zarr_store (zarr.Group): The opened Zarr store.
+    """
+    return _open_store_cached(os.fspath(path), store_backend)
+
+
+@functools.lru_cache(maxsize=_MAX_OPEN_STORES)
+def _open_store_cached(path, store_backend):
+    """
+    Opens a Zarr store in read-only mode, reusing the handle across load_* calls.
+    With zarr 3 the path is opened with zarr.open as is. With zarr 2 the consolidated
+    metadata (.zmetadata) is used when the store has it, so group and dataset lookups
+    do not need a listing per key, and chunks that have been read are kept in an
+    in-memory LRU cache, so reading the same data again (e.g. loading other sensors of
+    the same fiber) does not fetch it twice. Appends to the store are picked up
+    automatically, but consolidated metadata is read only once, so call
+    clear_store_cache() after consolidating the store again.
+
+    Parameters:
+        path (str): Path to the Zarr store.
+        store_backend (str, optional): 'kvikio' to read the chunks of a local store through
+            kvikio (GPUDirect Storage, or its POSIX thread pool where GDS is unavailable;
+            requires CUDA). Such a store is not wrapped in the chunk cache, and each dataset is
+            read in one call so kvikio gets all its chunk keys as one batch.
+            By default a local path is read directly from disk and a URL (e.g. 's3://...')
+            through fsspec.
+
+    Returns:
+        zarr_store (zarr.Group): The opened Zarr store.
+    """
+    if store_backend == 'kvikio':
+        if not _ZARR_V2:
+            raise ImportError("store_backend='kvikio' requires zarr version 2.")
+        try:
+            from kvikio.zarr import GDSStore
+        except ImportError:
+            raise ImportError("store_backend='kvikio' requires the 'kvikio' package.") from None
+        # kvikio only reads in GDSStore.getitems, which a cache wrapper would bypass
+        store = GDSStore(path)
+    elif store_backend is None:
+        if not _ZARR_V2:
+            # zarr 3 picks the store and uses consolidated metadata when present
+            return zarr.open(path, mode='r')
+
+        # Only remote stores need fsspec
+        if '://' in path:
+            store = zarr.storage.FSStore(path, mode='r')
+        else:
+            store = zarr.storage.DirectoryStore(path)
+        store = _ChunkCache(store, max_size=_CHUNK_CACHE_SIZE)
+    else:
+        raise ValueError(f"Unknown store_backend '{store_backend}', expected None or 'kvikio'.")
+
+    try:
+        return zarr.open_consolidated(store, mode='r')
+    except KeyError:
+        # No consolidated metadata in this store, fall back to a regular open
+        return zarr.open(store, mode='r')
+
+
+def clear_store_cache():
+    """
+    Clears the cached Zarr store handles and their chunk caches, e.g. after the metadata
+    of the store has been consolidated again.
+    """
+    _open_store_cached.cache_clear()
+
+
+def _get_group(zarr_store, group_name):
+    """
+    Accesses a group of a Zarr store, listing the store only if the group is missing.
+
+    Parameters:
+        zarr_store (zarr.Group): The opened Zarr store.
+        group_name (str): Name of the group to access.
+
+    Returns:
+        group (zarr.Group): The requested group.
+    """
+    try:
+        return zarr_store[group_name]
+    except KeyError:
+        raise KeyError(
+            f"Group '{group_name}' not found in the Zarr store. "
+            f"Available groups: {list(zarr_store.keys())}"
+        ) from None
+
+
+def _read_into(array, out, selection):
+    """
+    Reads a slice of a 1D Zarr dataset into the same slice of a preallocated numpy buffer.
+
+    Parameters:
+        array (zarr.Array): The dataset to read.
+        out (numpy.ndarray): Contiguous buffer with the same length and dtype as the dataset.
+        selection (slice): The part of the dataset to read.
+    """
+    if _ZARR_V2:
+        # Decompress the chunks straight into the buffer
+        array.get_basic_selection(selection, out=out[selection])
+    else:
+        out[selection] = array[selection]
+
+
+def _chunk_slices(array, split_chunks=True):
+    """
+    Splits a 1D Zarr dataset into the slices read by separate tasks in _read_datasets.
+
+    Parameters:
+        array (zarr.Array): The dataset to split.
+        split_chunks (bool): Whether to read every chunk as a separate task (zarr 2 only).
+
+    Returns:
+        selections (list of slice): One slice per chunk, or the whole dataset with zarr 3
+            or split_chunks=False.
+    """
+    if not (_ZARR_V2 and split_chunks):
+        return [slice(None)]
+    return [slice(start, start + array.chunks[0]) for start in range(0, array.shape[0], array.chunks[0])]
+
+
+def _read_datasets(arrays, outs=None, max_workers=16, split_chunks=True):
+    """
+    Reads whole 1D Zarr datasets, with the chunks of all of them fetched concurrently.
+
+    Parameters:
+        arrays (dict): Mapping of output name to the zarr.Array to read.
+        outs (dict, optional): Mapping of output name to a preallocated buffer with the same length
+            and dtype as the dataset. A buffer is allocated for every output name not in outs.
+        max_workers (int): Maximum number of chunk reads in flight.
+        split_chunks (bool): Whether to read every chunk as a separate task. False reads each
+            dataset in one call, so the store receives all its chunk keys in one getitems batch.
+
+    Returns:
+        data (dict): Mapping of output name to the loaded numpy array, in the order of arrays.
+    """
+    outs = dict(outs or {})
+    for name, array in arrays.items():
+        if name not in outs:
+            outs[name] = np.empty(array.shape, dtype=array.dtype)
+
+    # Chunk reads are independent I/O and decompression releases the GIL, so threads overlap well.
+    # zarr 3 already reads the chunks of one dataset concurrently, so it gets one read per dataset
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_read_into, array, outs[name], selection)
+            for name, array in arrays.items()
+            for selection in _chunk_slices(array, split_chunks)
+        ]
+        for future in futures:
+            future.result()
+
+    return {name: outs[name] for name in arrays}
+
+
+def _check_dtype_backend(dtype_backend):
+    """
+    Rejects an unknown dtype_backend before any data is read.
+
+    Parameters:
+        dtype_backend (str or None): The requested dtype backend.
+    """
+    if dtype_backend not in (None, 'pyarrow'):
+        raise ValueError(f"Unknown dtype_backend '{dtype_backend}', expected None or 'pyarrow'.")
+
+
+def _build_frame(data, dtype_backend=None):
+    """
+    Builds a DataFrame from a dictionary of freshly loaded numpy arrays without copying them.
+
+    Parameters:
+        data (dict): Mapping of column name to numpy array.
+        dtype_backend (str, optional): 'pyarrow' to wrap the arrays as Arrow-backed columns
+            (zero-copy for numeric arrays). By default the columns are numpy-backed.
+
+    Returns:
+        df (pandas.DataFrame): The DataFrame with one column per array.
+    """
+    if dtype_backend == 'pyarrow':
+        import pyarrow as pa
+        data = {col: pd.arrays.ArrowExtensionArray(pa.array(values)) for col, values in data.items()}
+
+    return pd.DataFrame(data, copy=False)
+
+
+def load_fiber_data(zarr_path, fiber_number, sensor_numbers, store_backend=None, dtype_backend=None):
     """
     Loads fiber timestamps and values for one or more sensors from a Zarr store.
 
@@ -9,244 +263,368 @@ def load_fiber_data(zarr_path, fiber_number, sensor_numbers):
         zarr_path (str): Path to the Zarr store.
         fiber_number (int): Fiber group number to load.
         sensor_numbers (int or list of int): One or multiple sensor dataset numbers within the fiber group.
+        store_backend (str, optional): 'kvikio' to read a local store through kvikio.
+        dtype_backend (str, optional): 'pyarrow' to return Arrow-backed columns.
 
     Returns:
         df (pandas.DataFrame): A DataFrame with a 'timestamp' column and one column per sensor.
     """
-    # Ensure sensor_numbers is a list
+    _check_dtype_backend(dtype_backend)
+
+    # Ensure sensor_numbers is a list without repeated sensors (one column per sensor)
     if isinstance(sensor_numbers, int):
         sensor_numbers = [sensor_numbers]
+    sensor_numbers = list(dict.fromkeys(sensor_numbers))
 
-    # Open the Zarr store in read-only mode
-    zarr_store = zarr.open(zarr_path, mode='r')
+    # Open the Zarr store in read-only mode (cached)
+    zarr_store = _open_store(zarr_path, store_backend)
 
     # Construct the group name for the fiber
     group_name = f"fibers_{fiber_number}"
 
-    # Check if the group exists in the store
-    if group_name not in zarr_store:
-        raise KeyError(
-            f"Group '{group_name}' not found in the Zarr store. "
-            f"Available groups: {list(zarr_store.keys())}"
-        )
+    # Access the fiber group (raises if it does not exist) and list its datasets once
+    fiber_group = _get_group(zarr_store, group_name)
+    keys = set(fiber_group)
 
-    # Access the fiber group
-    fiber_group = zarr_store[group_name]
-
-    # Load the timestamps (dataset '0')
-    if '0' not in fiber_group:
+    # Check that the timestamps (dataset '0') and every requested sensor exist
+    if '0' not in keys:
         raise ValueError(f"Dataset '0' (timestamps) not found in '{group_name}'.")
-    timestamps = fiber_group['0'][:]
-
-    # Create a dictionary for DataFrame construction
-    data = {'timestamp': timestamps}
-
-    # Load each requested sensor
     for s_num in sensor_numbers:
         s_str = str(s_num)
-        if s_str not in fiber_group:
+        if s_str not in keys:
             raise ValueError(f"Dataset '{s_str}' not found in '{group_name}'.")
 
-        values = fiber_group[s_str][:]
-
-        # Check for alignment
-        if len(values) != len(timestamps):
-            raise ValueError(
-                f"Length mismatch: {len(timestamps)} timestamps vs {len(values)} values "
-                f"in dataset '{s_str}' of '{group_name}'."
-            )
+    # Open the datasets once and check for alignment
+    timestamp_array = fiber_group['0']
+    sensor_arrays = [fiber_group[str(s_num)] for s_num in sensor_numbers]
+    n_rows = timestamp_array.shape[0]
+    lengths = np.fromiter((array.shape[0] for array in sensor_arrays), dtype=np.int64, count=len(sensor_arrays))
+    mismatched = np.flatnonzero(lengths != n_rows)
+    if mismatched.size:
+        i = mismatched[0]
+        raise ValueError(
+            f"Length mismatch: {n_rows} timestamps vs {lengths[i]} values "
+            f"in dataset '{sensor_numbers[i]}' of '{group_name}'."
+        )
 
-        # Add this sensor's data to the dictionary
-        data[f'sensor_{s_num}'] = values
+    columns = [f'sensor_{s_num}' for s_num in sensor_numbers]
 
-    # Convert to DataFrame
-    df = pd.DataFrame(data)
+    # When all sensors share a dtype, preallocate one column-major buffer so each sensor lands
+    # directly in its final column. Otherwise every sensor keeps its own dtype and array
+    dtypes = {array.dtype for array in sensor_arrays}
+    if len(dtypes) == 1:
+        values = np.empty((len(sensor_arrays), n_rows), dtype=dtypes.pop()).T
+        outs = {col: values[:, i] for i, col in enumerate(columns)}
+    else:
+        values = None
+        outs = None
+
+    # Load the timestamps and all sensors in parallel
+    arrays = {'timestamp': timestamp_array}
+    arrays.update(zip(columns, sensor_arrays))
+    data = _read_datasets(arrays, outs=outs, split_chunks=store_backend != 'kvikio')
+
+    if dtype_backend is None and values is not None:
+        # Convert to DataFrame as a single block, with the timestamps as the first column
+        df = pd.DataFrame(values, columns=columns, copy=False)
+        df.insert(0, 'timestamp', data['timestamp'])
+    else:
+        # Convert to DataFrame with every sensor column wrapped separately
+        df = _build_frame(data, dtype_backend)
 
     return df
 
 
-def load_vibration_data(zarr_path, vibration_number):
+def load_vibration_data(zarr_path, vibration_number, store_backend=None, dtype_backend=None):
     """
     Loads vibration timestamps and data from a Zarr store for a given vibration dataset.
     
     Parameters:
         path (str): Path to the Zarr store.
         vibration_number (int): The number identifying the vibration dataset to load.
+        store_backend (str, optional): 'kvikio' to read a local store through kvikio.
+        dtype_backend (str, optional): 'pyarrow' to return Arrow-backed columns.
         
     Returns:
         df (pandas.DataFrame): A DataFrame with 'timestamp' and 'data' columns.
     """
-    # Open the Zarr store in read-only mode
-    zarr_store = zarr.open(zarr_path, mode='r')
+    _check_dtype_backend(dtype_backend)
+
+    # Open the Zarr store in read-only mode (cached)
+    zarr_store = _open_store(zarr_path, store_backend)
     
     # Construct the group name for the vibration dataset
     group_name = f"vibration_{vibration_number}"
 
-    # Check if the group exists in the store
-    if group_name not in zarr_store:
-        raise KeyError(f"Group '{group_name}' not found in the Zarr store. "
-                       f"Available groups: {list(zarr_store.keys())}")
-
-    # Access the vibration group
-    vib_group = zarr_store[group_name]
+    # Access the vibration group (raises if it does not exist) and list its datasets once
+    vib_group = _get_group(zarr_store, group_name)
+    keys = set(vib_group)
 
     # Ensure that both Timestamp and Data datasets exist
-    if 'Timestamp' not in vib_group or 'Data' not in vib_group:
+    if 'Timestamp' not in keys or 'Data' not in keys:
         raise ValueError(f"Group '{group_name}' must contain 'Timestamp' and 'Data' datasets.")
 
-    # Load the timestamps and data arrays
-    timestamps = vib_group['Timestamp'][:]
-    values = vib_group['Data'][:]
-
     # Check alignment
-    if len(timestamps) != len(values):
-        raise ValueError(f"Mismatch between timestamps ({len(timestamps)}) and values ({len(values)}) in '{group_name}'.")
+    timestamp_array = vib_group['Timestamp']
+    value_array = vib_group['Data']
+    if timestamp_array.shape[0] != value_array.shape[0]:
+        raise ValueError(f"Mismatch between timestamps ({timestamp_array.shape[0]}) and values ({value_array.shape[0]}) in '{group_name}'.")
+
+    # Load the timestamps and data arrays, reading their chunks concurrently
+    data = _read_datasets({'timestamp': timestamp_array, 'data': value_array},
+                          split_chunks=store_backend != 'kvikio')
 
-    # Create the DataFrame
-    df = pd.DataFrame({
-        'timestamp': timestamps,
-        'data': values
-    })
+    # Create the DataFrame, reusing the freshly loaded arrays instead of copying them
+    df = _build_frame(data, dtype_backend)
 
     return df
 
 
-def load_other(path, group_name):
+def load_other(path, group_name, store_backend=None, dtype_backend=None):
     """
     Loads data from a Zarr store for a given group, with optional timestamps.
     
     Parameters:
         path (str): Path to the Zarr store.
         group_name (str): Name of the group to load (e.g., 'environment_rpm', 'environment_temperature', 'load_temperature').
+        store_backend (str, optional): 'kvikio' to read a local store through kvikio.
+        dtype_backend (str, optional): 'pyarrow' to return Arrow-backed columns.
         
     Returns:
         df (pandas.DataFrame): A DataFrame with relevant columns (timestamps included if available).
     """
-    # Open the Zarr store in read-only mode
-    zarr_store = zarr.open(path, mode='r')
-    
-    # Check if the group exists in the store
-    if group_name not in zarr_store:
-        raise KeyError(f"Group '{group_name}' not found in the Zarr store. "
-                       f"Available groups: {list(zarr_store.keys())}")
+    _check_dtype_backend(dtype_backend)
 
-    # Access the group
-    data_group = zarr_store[group_name]
+    # Open the Zarr store in read-only mode (cached)
+    zarr_store = _open_store(path, store_backend)
+    
+    # Access the group (raises if it does not exist)
+    data_group = _get_group(zarr_store, group_name)
 
     # Check for available datasets
     available_keys = list(data_group.keys())
     if not available_keys:
         raise ValueError(f"No datasets found in group '{group_name}'.")
+    keys = set(available_keys)
 
     # Check if there is a timestamp dataset (optional)
     timestamp_column = None
-    if '__time_UTC__s__' in data_group:
+    if '__time_UTC__s__' in keys:
         timestamp_column = '__time_UTC__s__'
-        timestamps = data_group[timestamp_column][:]
-    else:
-        timestamps = None  # No timestamps available
 
     # Load all other datasets dynamically
     data_columns = [key for key in available_keys if key != timestamp_column]
     if not data_columns:
         raise ValueError(f"No data columns found in group '{group_name}'.")
 
-    # Load all data columns
-    data = {col: data_group[col][:] for col in data_columns}
+    # Load the timestamps (if available) and all data columns in parallel
+    arrays = {'timestamp': data_group[timestamp_column]} if timestamp_column is not None else {}
+    arrays.update({col: data_group[col] for col in data_columns})
+    data = _read_datasets(arrays, split_chunks=store_backend != 'kvikio')
 
-    # Create the DataFrame
-    if timestamps is not None:
-        df = pd.DataFrame({
-            'timestamp': timestamps,
-            **data
-        })
-    else:
-        df = pd.DataFrame(data)
+    # Create the DataFrame, reusing the freshly loaded arrays instead of copying them
+    df = _build_frame(data, dtype_backend)
 
     return df
 
 
-import pandas as pd
+def _match_nearest(left_ts, right_ts, tolerance):
+    """
+    Finds for every left timestamp the nearest right timestamp, like merge_asof with direction='nearest'.
+
+    Parameters:
+        left_ts (numpy.ndarray): Sorted int64 timestamps to match.
+        right_ts (numpy.ndarray): Sorted int64 timestamps to match against.
+        tolerance (int): Maximum absolute difference for a match, in the same unit as the timestamps.
+
+    Returns:
+        nearest (numpy.ndarray): Position in right_ts of the nearest timestamp for every left timestamp.
+        matched (numpy.ndarray): Boolean mask, True where the nearest timestamp is within tolerance.
+    """
+    # searchsorted silently gives wrong matches on unsorted input, so check it like merge_asof does
+    if not (np.diff(left_ts) >= 0).all():
+        raise ValueError("left keys must be sorted")
+    if not (np.diff(right_ts) >= 0).all():
+        raise ValueError("right keys must be sorted")
+
+    if len(right_ts) == 0:
+        return np.zeros(len(left_ts), dtype=np.intp), np.zeros(len(left_ts), dtype=bool)
+
+    # Neighbours on both sides: the last right timestamp <= left and the first one > left
+    after = np.searchsorted(right_ts, left_ts, side='right')
+    before = np.clip(after - 1, 0, len(right_ts) - 1)
+    after = np.clip(after, 0, len(right_ts) - 1)
+    diff_before = np.abs(left_ts - right_ts[before])
+    diff_after = np.abs(right_ts[after] - left_ts)
+
+    # Ties go to the earlier timestamp, as in merge_asof
+    nearest = np.where(diff_before <= diff_after, before, after)
+    matched = np.minimum(diff_before, diff_after) <= tolerance
+
+    return nearest, matched
+
 
 def process_fibers(fiber_1: pd.DataFrame, fiber_2: pd.DataFrame) -> pd.DataFrame:
-    fiber_2 = fiber_2.rename(
-        columns={
-            "sensor_1": "f_sensor_2_1",
-            "sensor_2": "f_sensor_2_2",
-            "sensor_3": "f_sensor_2_3",
-            "sensor_4": "f_sensor_2_4",
-            "sensor_5": "f_sensor_2_5"
-        }
-    )
-    fiber_1 = fiber_1.rename(
-        columns={
-            "sensor_1": "f_sensor_1_1",
-            "sensor_2": "f_sensor_1_2",
-            "sensor_3": "f_sensor_1_3",
-            "sensor_4": "f_sensor_1_4",
-            "sensor_5": "f_sensor_1_5"
-        }
-    )
-    
-    fiber_1['timestamp'] = pd.to_datetime(fiber_1['timestamp'], unit='ns')
-    fiber_2['timestamp'] = pd.to_datetime(fiber_2['timestamp'], unit='ns')
+    """
+    Joins two fiber datasets on the nearest timestamp within 1 ms.
 
-    fiber = pd.merge_asof(
-        left=fiber_1,
-        right=fiber_2,
-        left_on='timestamp',
-        right_on='timestamp',
-        direction='nearest',
-        tolerance=pd.Timedelta('1ms')
-    )
+    Parameters:
+        fiber_1, fiber_2 (pandas.DataFrame): Loaded fiber datasets, sorted by timestamp.
 
-    fiber = fiber.drop('f_sensor_2_5', axis=1).dropna()
+    Returns:
+        fiber (pandas.DataFrame): A DataFrame with a nullable Int64 'timestamp_ns' column, the same
+            dtype as process_vibration returns (cast with pd.to_datetime(..., unit='ns')), and the
+            sensor columns of both fibers. Rows without a match or with missing values are dropped.
+    """
+    fiber_1_names = {
+        "sensor_1": "f_sensor_1_1",
+        "sensor_2": "f_sensor_1_2",
+        "sensor_3": "f_sensor_1_3",
+        "sensor_4": "f_sensor_1_4",
+        "sensor_5": "f_sensor_1_5"
+    }
+    fiber_2_names = {
+        "sensor_1": "f_sensor_2_1",
+        "sensor_2": "f_sensor_2_2",
+        "sensor_3": "f_sensor_2_3",
+        "sensor_4": "f_sensor_2_4"
+    }
+
+    # Sensor 5 of fiber 2 is not used, leave it out of the join so it is never copied
+    fiber_1_columns = fiber_1.columns.drop('timestamp')
+    fiber_2_columns = fiber_2.columns.drop(['timestamp', 'sensor_5'])
+
+    # Keep the timestamps as int64 nanoseconds for the join, no datetime conversion needed
+    timestamps_1 = fiber_1['timestamp'].to_numpy(dtype=np.int64)
+    timestamps_2 = fiber_2['timestamp'].to_numpy(dtype=np.int64)
+
+    # Match every fiber 1 row to the nearest fiber 2 row within 1 ms (in a single searchsorted pass)
+    nearest, matched = _match_nearest(timestamps_1, timestamps_2, tolerance=1_000_000)
+
+    # Take only the matched rows, under the new column names.
+    # The timestamps stay int64 nanoseconds, cast to datetime only when exporting
+    nearest = nearest[matched]
+    data = {'timestamp_ns': timestamps_1[matched]}
+    for col in fiber_1_columns:
+        data[fiber_1_names.get(col, col)] = fiber_1[col].to_numpy()[matched]
+    for col in fiber_2_columns:
+        data[fiber_2_names.get(col, col)] = fiber_2[col].to_numpy()[nearest]
+
+    # Drop the rows with missing sensor values, only filtering again if there are any
+    complete = np.logical_and.reduce([~pd.isna(values) for values in data.values()])
+    if not complete.all():
+        data = {col: values[complete] for col, values in data.items()}
+
+    # Build the combined DataFrame once from the underlying arrays, with the same nullable
+    # Int64 timestamps as process_vibration (none are missing here, so the mask is all False)
+    timestamps_ns = data['timestamp_ns']
+    data['timestamp_ns'] = pd.arrays.IntegerArray(timestamps_ns, np.zeros(len(timestamps_ns), dtype=bool))
+    fiber = pd.DataFrame(data, copy=False)
 
     return fiber
 
 
+# NaT as int64 nanoseconds
+_NAT = np.iinfo(np.int64).min
 
-import pandas as pd
 
-def process_vibration(
-    vibration_101: pd.DataFrame, 
-    vibration_102: pd.DataFrame, 
-    vibration_103: pd.DataFrame,
-    sample_rate: int = 25000,
-) -> pd.DataFrame:
-
-    # 1) Rename the 'data' columns
-    vibration_101 = vibration_101.rename(columns={"data": "vib_101"})
-    vibration_102 = vibration_102.rename(columns={"data": "vib_102"})
-    vibration_103 = vibration_103.rename(columns={"data": "vib_103"})
+def _block_timestamps_ns(timestamps_ns, sample_rate):
+    """
+    Single linear pass over int64 nanoseconds for _block_timestamps, compiled with numba when available.
+    """
+    out = np.empty_like(timestamps_ns)
+    block_start = _NAT
+    sample_index = -1
+    for i in range(len(timestamps_ns)):
+        if timestamps_ns[i] != _NAT:
+            block_start = timestamps_ns[i]
+            sample_index = 0
+        else:
+            sample_index += 1
+        if block_start == _NAT:
+            out[i] = _NAT
+        else:
+            out[i] = block_start + sample_index * 1_000_000_000 // sample_rate
+    return out
+
+
+if njit is not None:
+    _block_timestamps_ns = njit(cache=True)(_block_timestamps_ns)
+
+
+def _block_timestamps(timestamps_ns, sample_rate):
+    """
+    Fills in the timestamp of every vibration sample from the timestamp at the start of its block.
 
-    # 2) Combine into a single DataFrame
-    vibration_101["vib_102"] = vibration_102["vib_102"]
-    vibration_101["vib_103"] = vibration_103["vib_103"]
+    Parameters:
+        timestamps_ns (numpy.ndarray): int64 nanosecond timestamps, _NAT for every sample except the first of a block.
+        sample_rate (int): Number of samples per second.
 
-    # Rename for clarity
-    vibration = vibration_101
+    Returns:
+        timestamps_ns (numpy.ndarray): int64 nanosecond timestamp of every sample, _NAT before the first block.
+    """
+    if njit is not None:
+        return _block_timestamps_ns(timestamps_ns, sample_rate)
 
-    # 3) Convert timestamp from seconds to DateTime
-    vibration['timestamp'] = pd.to_datetime(vibration['timestamp'], unit='s')
+    positions = np.arange(len(timestamps_ns))
 
-    # 4) Adjust timestamps for correct alignment using sample rate
-    #    (Revised so 'sample_index' is an integer, not a datetime)
-    blocks = vibration['timestamp'].notna().cumsum()
+    # block_head: position of the first row of each row's block (a single running max, no groupby)
+    block_head = np.maximum.accumulate(np.where(timestamps_ns != _NAT, positions, 0))
 
     # block_start: the first timestamp in each block
-    vibration['block_start'] = vibration.groupby(blocks)['timestamp'].transform('first')
+    block_start = timestamps_ns[block_head]
 
     # sample_index: counts from 0, 1, 2... for each block
-    vibration['sample_index'] = vibration.groupby(blocks).cumcount()
+    sample_index = positions - block_head
+
+    # Recompute the timestamp, with the offsets computed directly as integer nanoseconds
+    offsets_ns = sample_index.astype(np.int64) * 1_000_000_000 // sample_rate
+    return np.where(block_start == _NAT, _NAT, block_start + offsets_ns)
+
+
+def process_vibration(
+    vibration_101: pd.DataFrame, 
+    vibration_102: pd.DataFrame, 
+    vibration_103: pd.DataFrame,
+    sample_rate: int = 25000,
+) -> pd.DataFrame:
+    """
+    Combines three vibration datasets and fills in the timestamp of every sample.
 
-    # Recompute the timestamp
-    vibration['timestamp'] = (
-        vibration['block_start'] 
-        + pd.to_timedelta(vibration['sample_index'] / sample_rate, unit='s')
-    )
+    Parameters:
+        vibration_101, vibration_102, vibration_103 (pandas.DataFrame): Loaded vibration datasets.
+        sample_rate (int): Number of samples per second.
 
-    vibration.drop(columns=['block_start', 'sample_index'], inplace=True)
+    Returns:
+        vibration (pandas.DataFrame): A DataFrame with a nullable Int64 'timestamp_ns' column
+            (<NA> for samples before the first timestamp; cast with pd.to_datetime(..., unit='ns'))
+            and one column per vibration dataset.
+    """
+    # 1) Convert timestamp from seconds to int64 nanoseconds (missing timestamps become _NAT)
+    timestamps_s = vibration_101['timestamp'].to_numpy(dtype=np.float64)
+    missing = np.isnan(timestamps_s)
+    timestamps_s = np.where(missing, 0.0, timestamps_s)
+    #    Whole and fractional seconds are converted separately, as pd.to_datetime does, since
+    #    float64 epoch seconds scaled by 1e9 in one go lose the nanosecond digits
+    base = np.floor(timestamps_s)
+    fraction_ns = (np.round(timestamps_s - base, 9) * 1e9).astype(np.int64)
+    timestamps_ns = base.astype(np.int64) * 1_000_000_000 + fraction_ns
+    timestamps_ns[missing] = _NAT
+
+    # 2) Adjust timestamps for correct alignment using sample rate
+    #    (Each block starts at a row with a timestamp, the rows after it have none)
+    timestamps_ns = _block_timestamps(timestamps_ns, sample_rate)
+
+    # 3) Combine the renamed 'data' columns into a single DataFrame, built once from the arrays.
+    #    The timestamps stay int64 nanoseconds, cast to datetime only when exporting. The _NAT
+    #    sentinel is masked so missing timestamps show up as <NA> instead of a huge negative number.
+    #    vib_102 and vib_103 are aligned to vib_101 by index, as the datasets can differ in length
+    vibration = pd.DataFrame({
+        'timestamp_ns': pd.arrays.IntegerArray(timestamps_ns, timestamps_ns == _NAT),
+        'vib_101': vibration_101['data'].to_numpy(),
+        'vib_102': vibration_102['data'].reindex(vibration_101.index).to_numpy(),
+        'vib_103': vibration_103['data'].reindex(vibration_101.index).to_numpy()
+    }, copy=False)
 
     return vibration
 